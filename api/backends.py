@@ -0,0 +1,90 @@
+# backends.py
+import os
+import chess
+import chess.engine
+from anthropic import Anthropic
+
+# Skill level and thinking time (seconds) for each difficulty
+SKILL_LEVELS = {
+    "easy": (3, 0.1),
+    "medium": (10, 0.3),
+    "hard": (20, 0.5),
+}
+
+# Try different common Stockfish paths
+STOCKFISH_PATHS = [
+    "/opt/homebrew/bin/stockfish",  # Mac ARM (Apple Silicon)
+    "/usr/local/bin/stockfish",    # Mac Intel
+    "stockfish"                    # System PATH
+]
+
+class StockfishEngine:
+    """Engine backend for GameCore: plays moves with Stockfish at the skill level of the current difficulty."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @classmethod
+    def open(cls, difficulty="easy"):
+        """Start Stockfish from the first path that works, or return None if it is not installed."""
+        try:
+            for path in STOCKFISH_PATHS:
+                try:
+                    engine = chess.engine.SimpleEngine.popen_uci(path)
+                    break
+                except FileNotFoundError:
+                    continue
+            else:
+                raise FileNotFoundError("Could not find Stockfish in any standard location")
+            backend = cls(engine)
+            backend.set_difficulty(difficulty)
+            return backend
+        except Exception as e:
+            print(f"Error initializing chess engine: {e}"
+                  "\nPlease install Stockfish with: brew install stockfish")
+            return None
+
+    def set_difficulty(self, difficulty):
+        skill_level, _ = SKILL_LEVELS[difficulty]
+        self.engine.configure({"Skill Level": skill_level})
+
+    def play(self, board, difficulty):
+        skill_level, time_limit = SKILL_LEVELS[difficulty]
+        self.engine.configure({"Skill Level": skill_level})
+        result = self.engine.play(board,
+                                  chess.engine.Limit(time=time_limit),
+                                  info=chess.engine.INFO_ALL)
+        return result.move
+
+    def quit(self):
+        self.engine.quit()
+
+class AnthropicRiddler:
+    """LLM backend for GameCore: composes riddles with the Anthropic API."""
+
+    model = "claude-3-opus-20240229"
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_env(cls):
+        """Build a riddler from ANTHROPIC_API_KEY, or return None if the key is not set."""
+        api_key = os.getenv('ANTHROPIC_API_KEY')
+        if not api_key:
+            print("Warning: ANTHROPIC_API_KEY environment variable not set. Hints will not be available.")
+            return None
+        return cls(Anthropic(api_key=api_key))
+
+    def compose(self, prompt, system):
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=300,
+            temperature=0.9,
+            system=system,
+            messages=[{
+                "role": "user",
+                "content": prompt
+            }]
+        )
+        return message.content[0].text.strip()
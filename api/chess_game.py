@@ -1,16 +1,22 @@
 # chess_game.py
-import os
 import chess
-import chess.engine
 import tkinter as tk
 from tkinter import font, messagebox
-import random
-from anthropic import Anthropic
 from tkfontchooser import askfont
 import utilities  # Ensure this module is bundled
+try:
+    import tactics
+    from backends import StockfishEngine, AnthropicRiddler
+    from game_core import GameCore
+except ImportError:  # imported as api.chess_game (e.g. from the tests)
+    from api import tactics
+    from api.backends import StockfishEngine, AnthropicRiddler
+    from api.game_core import GameCore
 
 class ChessGame:
-    def __init__(self):
+    """Tk view over a GameCore. Pass a core to reuse injected backends; by default Stockfish and Anthropic are used."""
+
+    def __init__(self, core=None):
         self.window = tk.Tk()
         self.window.title("Chess Game")
         
@@ -42,14 +48,6 @@ class ChessGame:
         self.electra_font = 'ElectraLTStd'
         self.electra_font_large = 'ElectraLTStdLarge'
         
-        # Initialize Anthropic client with API key
-        api_key = os.getenv('ANTHROPIC_API_KEY')
-        if not api_key:
-            print("Warning: ANTHROPIC_API_KEY environment variable not set. Hints will not be available.")
-            self.anthropic = None
-        else:
-            self.anthropic = Anthropic(api_key=api_key)
-        
         # Set minimum window size
         self.window.geometry("1200x900")
         self.window.minsize(1200, 600)
@@ -62,34 +60,16 @@ class ChessGame:
         self.game_area = tk.Frame(self.main_frame, bg=default_bg)
         self.game_area.pack(expand=True, fill='both')
         
-        self.board = chess.Board()
+        if core is None:
+            core = GameCore(engine=StockfishEngine.open(),
+                            llm=AnthropicRiddler.from_env(),
+                            puzzle_bank=tactics.PuzzleBank.load(tactics.DEFAULT_INDEX_PATH))
+        self.core = core
+        self.core.on("move_applied", lambda move: self.update_board_display())
+        self.core.on("engine_moved", self.on_engine_moved)
+        self.core.on("hint_ready", self.show_hint)
+        self.core.on("game_over", self.show_game_over)
         self.buttons = [[None for _ in range(8)] for _ in range(8)]
-        self.selected_square = None
-        self.difficulty = "easy"
-        
-        # Initialize chess engine
-        try:
-            # Try different common Stockfish paths
-            stockfish_paths = [
-                "/opt/homebrew/bin/stockfish",  # Mac ARM (Apple Silicon)
-                "/usr/local/bin/stockfish",    # Mac Intel
-                "stockfish"                    # System PATH
-            ]
-            
-            for path in stockfish_paths:
-                try:
-                    self.engine = chess.engine.SimpleEngine.popen_uci(path)
-                    break
-                except FileNotFoundError:
-                    continue
-            else:
-                raise FileNotFoundError("Could not find Stockfish in any standard location")
-            self.engine.configure({"Skill Level": 3})  # Start with easy mode
-        except Exception as e:
-            print(f"Error initializing chess engine: {e}"
-                  "\nPlease install Stockfish with: brew install stockfish")
-            self.engine = None
-        self.player_color = chess.WHITE
         
         # Create board frame
         board_container = tk.Frame(self.game_area)
@@ -146,6 +126,18 @@ class ChessGame:
         self.new_game_button.pack()
         self.new_game_button.bind("<Button-1>", lambda e: self.new_game())
         
+        # Create puzzle button, which serves a themed position from the puzzle index
+        self.puzzle_button = tk.Label(button_frame, 
+                                    text="Puzzle", 
+                                    font=self.electra_font_large,
+                                    bg=default_bg,
+                                    cursor="hand2")
+        self.puzzle_button.pack(pady=(10, 0))
+        self.puzzle_button.bind("<Button-1>", lambda e: self.load_puzzle(self.theme_var.get() or None))
+        
+        # Create theme selection for the puzzle button
+        self.create_theme_selector(button_frame)
+        
         # Create controls frame below the board
         self.controls_frame = tk.Frame(board_container, bg=default_bg)
         self.controls_frame.pack(pady=20)
@@ -176,6 +168,27 @@ class ChessGame:
                           font=self.electra_font_large,
                           bg=self.window.cget('bg')).pack(side=tk.LEFT, padx=10)
 
+    def create_theme_selector(self, parent):
+        controls_container = tk.Frame(parent, bg=self.window.cget('bg'))
+        controls_container.pack(pady=(10, 0))
+        
+        tk.Label(controls_container, 
+                text="Theme:", 
+                font=self.electra_font_large,
+                bg=self.window.cget('bg')).pack(anchor='w')
+        
+        # An empty value means any theme
+        self.theme_var = tk.StringVar(value="")
+        themes = [("Any", "")] + [(theme.replace("_", " ").capitalize(), theme) for theme in tactics.THEMES]
+        
+        for text, theme in themes:
+            tk.Radiobutton(controls_container, 
+                          text=text, 
+                          variable=self.theme_var,
+                          value=theme, 
+                          font=self.electra_font,
+                          bg=self.window.cget('bg')).pack(anchor='w')
+
     def create_board(self):
         square_size = 80  # Slightly larger square size
         
@@ -189,8 +202,7 @@ class ChessGame:
         
         for row in range(8):
             for col in range(8):
-                i = 7 - row
-                color = "white" if (i + col) % 2 == 0 else "gray"
+                color = self.square_color(row, col)
                 button = tk.Button(self.board_frame, 
                                  bg=color,
                                  width=4,
@@ -202,150 +214,61 @@ class ChessGame:
         
         self.update_board_display()
 
+    @property
+    def board(self):
+        return self.core.board
+
+    @property
+    def engine(self):
+        return self.core.engine
+
+    @property
+    def selected_square(self):
+        return self.core.selected_square
+
+    @property
+    def difficulty(self):
+        return self.core.difficulty
+
+    @difficulty.setter
+    def difficulty(self, value):
+        self.core.difficulty = value
+
+    def square_color(self, row, col):
+        return "white" if ((7 - row) + col) % 2 == 0 else "gray"
+
     def change_difficulty(self):
-        self.difficulty = self.difficulty_var.get().lower()
-        if self.engine:
-            # Adjust engine skill level based on difficulty
-            if self.difficulty == "easy":
-                self.engine.configure({"Skill Level": 3})
-            elif self.difficulty == "medium":
-                self.engine.configure({"Skill Level": 10})
-            else:  # hard
-                self.engine.configure({"Skill Level": 20})
+        self.core.set_difficulty(self.difficulty_var.get().lower())
 
     def square_clicked(self, row, col):
-        board_row = 7 - row
-        board_square = board_row * 8 + col
-        
-        if self.selected_square is None:
-            piece = self.board.piece_at(board_square)
-            if piece and piece.color == self.player_color:
-                self.selected_square = board_square
-                self.buttons[row][col].config(bg='lightblue')
-        else:
-            move = chess.Move(self.selected_square, board_square)
-            
-            prev_square = self.selected_square
+        board_square = (7 - row) * 8 + col
+        prev_square = self.core.selected_square
+        self.core.square_clicked(board_square)
+        
+        if prev_square is not None:
             prev_row = 7 - (prev_square // 8)
             prev_col = prev_square % 8
-            self.buttons[prev_row][prev_col].config(bg='white' if (prev_row + prev_col) % 2 == 0 else 'gray')
-            self.selected_square = None
-            
-            if move in self.board.legal_moves:
-                self.board.push(move)
-                self.update_board_display()
-                
-                if self.board.is_game_over():
-                    self.show_game_over()
-                else:
-                    self.make_ai_move()
+            self.buttons[prev_row][prev_col].config(bg=self.square_color(prev_row, prev_col))
+        elif self.core.selected_square is not None:
+            self.buttons[row][col].config(bg='lightblue')
 
     def make_ai_move(self):
-        if self.board.is_game_over() or not self.engine:
-            return
-            
-        try:
-            # Configure engine based on difficulty
-            if self.difficulty == "easy":
-                self.engine.configure({"Skill Level": 3})
-                time_limit = 0.1
-            elif self.difficulty == "medium":
-                self.engine.configure({"Skill Level": 10})
-                time_limit = 0.3
-            else:  # hard
-                self.engine.configure({"Skill Level": 20})
-                time_limit = 0.5
-            
-            # Get engine's best move
-            result = self.engine.play(self.board, 
-                                    chess.engine.Limit(time=time_limit),
-                                    info=chess.engine.INFO_ALL)
-            self.board.push(result.move)
-            self.update_board_display()
-            
-            if self.board.is_game_over():
-                self.show_game_over()
-            else:
-                # After AI moves, analyze the position and generate a hint for the player's best move
-                self.window.after(200, self.generate_player_hint)
-        except Exception as e:
-            print(f"Error making AI move: {e}")
+        self.core.make_engine_move()
 
-    def generate_player_hint(self):
-        if not self.anthropic:
-            return
-            
-        try:
-            # Analyze current position for best player moves
-            legal_moves = list(self.board.legal_moves)
-            if not legal_moves:
-                return
-                
-            # Select a strong move for the player (in a real implementation, 
-            # you might want to use a chess engine here)
-            suggested_move = random.choice(legal_moves)
-            
-            # Get the piece making the suggested move
-            piece = self.board.piece_at(suggested_move.from_square)
-            if not piece:
-                return
-                
-            piece_type = chess.piece_name(piece.piece_type).capitalize()
-            from_square = chess.square_name(suggested_move.from_square)
-            to_square = chess.square_name(suggested_move.to_square)
-            
-            # Get the target square's piece (if any)
-            target_piece = self.board.piece_at(suggested_move.to_square)
-            is_capture = target_piece is not None
-            
-            # Analyze the position
-            is_check = self.board.is_check()
-            attacked_squares = [chess.square_name(sq) for sq in chess.SQUARES 
-                              if self.board.is_attacked_by(not self.board.turn, sq)]
-            defended_squares = [chess.square_name(sq) for sq in chess.SQUARES 
-                              if self.board.is_attacked_by(self.board.turn, sq)]
-            
-            # Get all pieces positions for more complex riddles
-            all_pieces = []
-            for sq in chess.SQUARES:
-                p = self.board.piece_at(sq)
-                if p:
-                    all_pieces.append((chess.square_name(sq), chess.piece_name(p.piece_type), p.color))
+    def on_engine_moved(self, move):
+        self.update_board_display()
+        if not self.board.is_game_over():
+            # After AI moves, analyze the position and generate a hint for the player's best move
+            self.window.after(200, self.generate_player_hint)
 
-            # Get potential tactical themes
-            is_pin = any(self.board.is_pinned(self.board.turn, sq) for sq in chess.SQUARES)
-            material_count = sum(len(self.board.pieces(piece_type, True)) for piece_type in chess.PIECE_TYPES)
-            is_endgame = material_count <= 10
-            
-            difficulty_prompts = {
-                "easy": f"Create a chess riddle about a critical {piece_type} move. Reference the current position with {piece_type} on {from_square} and potential destination {to_square}. Include these tactical elements: capture={is_capture}, check={is_check}. Make it challenging but solvable.",
-                
-                "medium": f"Create a sophisticated chess riddle involving a {piece_type} on {from_square}. Include these positional elements: attacked squares={attacked_squares[:3]}, defended squares={defended_squares[:3]}, pins present={is_pin}. The solution involves square {to_square}. Use chess terminology and make it require deep tactical understanding.",
-                
-                "hard": f"Create an expert-level chess riddle about a critical {piece_type} move from {from_square}. Consider these elements: captures={is_capture}, checks={is_check}, pins={is_pin}, phase={('endgame' if is_endgame else 'middlegame')}, piece positions={all_pieces[:5]}. The key square is {to_square}. Create a multi-layered puzzle that requires understanding of positional chess, tactical patterns, and strategic planning. Include multiple red herrings and intermediate objectives before revealing the final solution. Reference concrete squares and pieces in the position."
-            }
-            
-            prompt = difficulty_prompts[self.difficulty.lower()]
-            
-            message = self.anthropic.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=300,
-                temperature=0.9,
-                system="You are a friendly chess riddle composer who creates engaging and clear chess puzzles. Your riddles use chess terminology and tactical themes while remaining concise and approachable. Create riddles that hint at the key moves using simple metaphors and clear references to the position. Keep the riddles focused on one main tactical idea, using 2-3 lines of text. Use chess terminology naturally but avoid making the riddles overly complex. Your riddles should be fun and solvable for players of all skill levels. Only output the riddle text.",
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-            
-            hint = message.content[0].text.strip()
-            self.hint_text.config(state=tk.NORMAL)
-            self.hint_text.delete(1.0, tk.END)
-            self.hint_text.insert(tk.END, hint)
-            self.hint_text.config(state=tk.DISABLED)
-            
-        except Exception as e:
-            print(f"Error generating hint: {e}")
+    def generate_player_hint(self, motif=None):
+        self.core.generate_hint(motif)
+
+    def show_hint(self, hint):
+        self.hint_text.config(state=tk.NORMAL)
+        self.hint_text.delete(1.0, tk.END)
+        self.hint_text.insert(tk.END, hint)
+        self.hint_text.config(state=tk.DISABLED)
 
     def update_board_display(self):
         piece_symbols = {
@@ -361,30 +284,28 @@ class ChessGame:
                 self.buttons[row][col].config(
                     text=text,
                     font='ElectraLTStdPieces',
-                    bg="white" if ((7 - row) + col) % 2 == 0 else "gray"
+                    bg=self.square_color(row, col)
                 )
 
     def new_game(self):
-        self.board.reset()
-        self.selected_square = None
-        self.player_color = chess.WHITE
-        for row in range(8):
-            for col in range(8):
-                color = "white" if ((7 - row) + col) % 2 == 0 else "gray"
-                self.buttons[row][col].config(bg=color)
+        self.core.new_game()
         self.update_board_display()
         self.hint_text.config(state=tk.NORMAL)
         self.hint_text.delete(1.0, tk.END)
         self.hint_text.config(state=tk.DISABLED)
         self.hint_text.config(height=1)
 
-    def show_game_over(self):
-        result = "Draw"
-        if self.board.is_checkmate():
-            result = "Black wins!" if self.board.turn == chess.WHITE else "White wins!"
-        elif self.board.is_stalemate():
-            result = "Stalemate!"
+    def load_puzzle(self, theme=None):
+        # The core only resets the game once it has a puzzle, so a miss leaves the current game alone
+        if not self.core.load_puzzle(theme):
+            self.show_hint("No puzzles indexed yet. Build one with: python api/tactics.py games.pgn")
+            return
         
+        self.update_board_display()
+        self.show_hint("")
+        self.window.after(200, self.generate_player_hint)
+
+    def show_game_over(self, result):
         messagebox.showinfo("Game Over", result, font=self.electra_font)
 
     def run(self):
@@ -393,8 +314,8 @@ class ChessGame:
             self.window.mainloop()
         finally:
             # Clean up chess engine when the window is closed
-            if hasattr(self, 'engine') and self.engine:
-                self.engine.quit()
+            if self.core.engine:
+                self.core.engine.quit()
 
 if __name__ == "__main__":
     from welcome_screen import WelcomeScreen
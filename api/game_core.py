@@ -0,0 +1,198 @@
+# game_core.py
+import random
+import chess
+try:
+    import tactics
+except ImportError:  # imported as api.game_core (e.g. from the tests)
+    from api import tactics
+
+EVENTS = ["move_applied", "engine_moved", "hint_ready", "game_over"]
+
+RIDDLE_SYSTEM_PROMPT = "You are a friendly chess riddle composer who creates engaging and clear chess puzzles. Your riddles use chess terminology and tactical themes while remaining concise and approachable. Create riddles that hint at the key moves using simple metaphors and clear references to the position. Keep the riddles focused on one main tactical idea, using 2-3 lines of text. Use chess terminology naturally but avoid making the riddles overly complex. Your riddles should be fun and solvable for players of all skill levels. Only output the riddle text."
+
+class GameCore:
+    """
+    Game logic without any GUI. Views subscribe to events with on():
+      move_applied(move)  - the player's move was pushed
+      engine_moved(move)  - the engine replied
+      hint_ready(hint)    - a riddle was composed
+      game_over(result)   - the game ended, with a result message
+    The engine backend needs play(board, difficulty), set_difficulty(difficulty) and quit();
+    the LLM backend needs compose(prompt, system). Either may be None.
+    """
+
+    def __init__(self, engine=None, llm=None, puzzle_bank=None):
+        self.board = chess.Board()
+        self.engine = engine
+        self.llm = llm
+        self.puzzle_bank = puzzle_bank
+        self.difficulty = "easy"
+        self.player_color = chess.WHITE
+        self.selected_square = None
+        self.puzzle = None
+        self.listeners = {event: [] for event in EVENTS}
+
+    def on(self, event, callback):
+        if event not in self.listeners:
+            raise ValueError(f"Unknown event: {event}")
+        self.listeners[event].append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners[event]:
+            callback(*args)
+
+    def new_game(self):
+        self.board.reset()
+        self.puzzle = None
+        self.selected_square = None
+        self.player_color = chess.WHITE
+
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        if self.engine:
+            self.engine.set_difficulty(difficulty)
+
+    def square_clicked(self, square):
+        """Select one of the player's pieces, or move the selected piece to square. Returns True if a move was made."""
+        if self.selected_square is None:
+            piece = self.board.piece_at(square)
+            if piece and piece.color == self.player_color:
+                self.selected_square = square
+            return False
+
+        move = chess.Move(self.selected_square, square)
+        self.selected_square = None
+        return self.play_move(move)
+
+    def play_move(self, move):
+        if move not in self.board.legal_moves:
+            return False
+        self.board.push(move)
+        self.emit("move_applied", move)
+
+        if self.board.is_game_over():
+            self.emit("game_over", self.game_result())
+        else:
+            self.make_engine_move()
+        return True
+
+    def make_engine_move(self):
+        if self.board.is_game_over() or not self.engine:
+            return None
+
+        try:
+            move = self.engine.play(self.board, self.difficulty)
+        except Exception as e:
+            print(f"Error making AI move: {e}")
+            return None
+
+        self.board.push(move)
+        self.emit("engine_moved", move)
+
+        if self.board.is_game_over():
+            self.emit("game_over", self.game_result())
+        return move
+
+    def game_result(self):
+        result = "Draw"
+        if self.board.is_checkmate():
+            result = "Black wins!" if self.board.turn == chess.WHITE else "White wins!"
+        elif self.board.is_stalemate():
+            result = "Stalemate!"
+        return result
+
+    def load_puzzle(self, theme=None):
+        """
+        Set up a themed position from the puzzle bank, preferring the current difficulty but falling back to any.
+        Returns the puzzle, or None if the bank has nothing for this theme.
+        """
+        if not self.puzzle_bank:
+            return None
+        puzzle = self.puzzle_bank.random_puzzle(theme, self.difficulty) or self.puzzle_bank.random_puzzle(theme)
+        if not puzzle:
+            return None
+
+        self.new_game()
+        self.puzzle = puzzle
+        self.board.set_fen(puzzle["fen"])
+        self.player_color = self.board.turn
+        return puzzle
+
+    def hint_prompt(self, motif=None):
+        """Build the riddle prompt for the side to move, or return None if there is nothing to hint at."""
+        # Analyze current position for best player moves
+        legal_moves = list(self.board.legal_moves)
+        if not legal_moves:
+            return None
+
+        # A freshly loaded puzzle already knows its motif, so skip live analysis
+        if motif is None and self.puzzle and self.board.fen() == self.puzzle["fen"]:
+            motif = tactics.Motif(self.puzzle["theme"], chess.Move.from_uci(self.puzzle["move"]))
+
+        # Prefer a move that plays a tactical motif; fall back to any legal move
+        if motif is None:
+            motifs = tactics.detect_motifs(self.board)
+            motif = random.choice(motifs) if motifs else None
+        else:
+            motifs = [motif]
+        suggested_move = motif.move if motif else random.choice(legal_moves)
+        themes = sorted({m.theme for m in motifs if m.move == suggested_move})
+        theme_names = ", ".join(t.replace("_", " ") for t in themes) or "none"
+
+        # Get the piece making the suggested move
+        piece = self.board.piece_at(suggested_move.from_square)
+        if not piece:
+            return None
+
+        piece_type = chess.piece_name(piece.piece_type).capitalize()
+        from_square = chess.square_name(suggested_move.from_square)
+        to_square = chess.square_name(suggested_move.to_square)
+
+        # Get the target square's piece (if any)
+        target_piece = self.board.piece_at(suggested_move.to_square)
+        is_capture = target_piece is not None
+
+        # Analyze the position
+        is_check = self.board.gives_check(suggested_move)
+        attacked_squares = [chess.square_name(sq) for sq in chess.SQUARES
+                          if self.board.is_attacked_by(not self.board.turn, sq)]
+        defended_squares = [chess.square_name(sq) for sq in chess.SQUARES
+                          if self.board.is_attacked_by(self.board.turn, sq)]
+
+        # Get all pieces positions for more complex riddles
+        all_pieces = []
+        for sq in chess.SQUARES:
+            p = self.board.piece_at(sq)
+            if p:
+                all_pieces.append((chess.square_name(sq), chess.piece_name(p.piece_type), p.color))
+
+        material_count = sum(len(self.board.pieces(piece_type, True)) for piece_type in chess.PIECE_TYPES)
+        is_endgame = material_count <= 10
+
+        difficulty_prompts = {
+            "easy": f"Create a chess riddle about a critical {piece_type} move. Reference the current position with {piece_type} on {from_square} and potential destination {to_square}. Include these tactical elements: capture={is_capture}, check={is_check}, tactical motifs={theme_names}. Make it challenging but solvable.",
+
+            "medium": f"Create a sophisticated chess riddle involving a {piece_type} on {from_square}. Include these positional elements: attacked squares={attacked_squares[:3]}, defended squares={defended_squares[:3]}, tactical motifs={theme_names}. The solution involves square {to_square}. Use chess terminology and make it require deep tactical understanding.",
+
+            "hard": f"Create an expert-level chess riddle about a critical {piece_type} move from {from_square}. Consider these elements: captures={is_capture}, checks={is_check}, tactical motifs={theme_names}, phase={('endgame' if is_endgame else 'middlegame')}, piece positions={all_pieces[:5]}. The key square is {to_square}. Create a multi-layered puzzle that requires understanding of positional chess, tactical patterns, and strategic planning. Include multiple red herrings and intermediate objectives before revealing the final solution. Reference concrete squares and pieces in the position."
+        }
+
+        return difficulty_prompts[self.difficulty.lower()]
+
+    def generate_hint(self, motif=None):
+        """Compose a riddle for the current position and emit hint_ready. Returns the hint, or None."""
+        if not self.llm:
+            return None
+
+        prompt = self.hint_prompt(motif)
+        if prompt is None:
+            return None
+
+        try:
+            hint = self.llm.compose(prompt, RIDDLE_SYSTEM_PROMPT)
+        except Exception as e:
+            print(f"Error generating hint: {e}")
+            return None
+
+        self.emit("hint_ready", hint)
+        return hint
@@ -0,0 +1,342 @@
+# tactics.py
+import json
+import os
+import random
+import argparse
+import itertools
+import tempfile
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+import chess.pgn
+
+THEMES = ["fork", "pin", "skewer", "discovered_attack", "back_rank_mate", "hanging_piece"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+PIECE_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 100,
+}
+
+# How hard each theme is to spot, before adjusting for quiet moves
+THEME_DIFFICULTY = {
+    "hanging_piece": 0,
+    "fork": 1,
+    "pin": 1,
+    "back_rank_mate": 1,
+    "skewer": 2,
+    "discovered_attack": 2,
+}
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_index.json")
+
+SLIDERS = (chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+Motif = namedtuple("Motif", ["theme", "move"])
+
+
+def value_of(board, square):
+    piece = board.piece_at(square)
+    return PIECE_VALUES[piece.piece_type] if piece else 0
+
+
+def is_safe(board, square, color):
+    """A piece is safe if nothing attacks it, or it is defended and every attacker is worth at least as much."""
+    attackers = board.attackers(not color, square)
+    if not attackers:
+        return True
+    if not board.is_attacked_by(color, square):
+        return False
+    return min(value_of(board, sq) for sq in attackers) >= value_of(board, square)
+
+
+def is_undefended(board, square):
+    piece = board.piece_at(square)
+    return not board.is_attacked_by(piece.color, square)
+
+
+def find_fork(after, move, us):
+    them = not us
+    moved_value = value_of(after, move.to_square)
+    if not is_safe(after, move.to_square, us):
+        return False
+    targets = [sq for sq in after.attacks(move.to_square)
+               if after.color_at(sq) == them
+               and (value_of(after, sq) > moved_value or is_undefended(after, sq))]
+    return len(targets) >= 2
+
+
+def find_pin(after, move, us):
+    them = not us
+    if after.piece_type_at(move.to_square) not in SLIDERS or not is_safe(after, move.to_square, us):
+        return False
+    king = after.king(them)
+    if king is None:
+        return False
+    blockers = chess.SquareSet(chess.between(king, move.to_square) & after.occupied)
+    if len(blockers) != 1:
+        return False
+    pinned = blockers.pop()
+    return after.color_at(pinned) == them and after.is_pinned(them, pinned)
+
+
+def find_skewer(after, move, us):
+    them = not us
+    if after.piece_type_at(move.to_square) not in SLIDERS:
+        return False
+    if not is_safe(after, move.to_square, us):
+        return False
+    for front in after.attacks(move.to_square):
+        if after.color_at(front) != them or after.piece_type_at(front) not in (chess.KING, chess.QUEEN):
+            continue
+        for back in chess.SquareSet(chess.ray(move.to_square, front)):
+            if after.color_at(back) != them or back == front:
+                continue
+            blockers = chess.between(move.to_square, back) & after.occupied
+            if blockers == chess.BB_SQUARES[front] and value_of(after, front) > value_of(after, back):
+                return True
+    return False
+
+
+def find_discovered_attack(before, after, move, us):
+    them = not us
+    for slider in after.pieces(chess.BISHOP, us) | after.pieces(chess.ROOK, us) | after.pieces(chess.QUEEN, us):
+        if slider == move.to_square:
+            continue
+        for target in after.attacks(slider) & after.occupied_co[them]:
+            if not chess.between(slider, target) & chess.BB_SQUARES[move.from_square]:
+                continue
+            if before.attacks(slider) & chess.BB_SQUARES[target]:
+                continue
+            if (after.piece_type_at(target) == chess.KING
+                    or value_of(after, target) > value_of(after, slider)
+                    or is_undefended(after, target)):
+                return True
+    return False
+
+
+def find_back_rank_mate(after, move, us):
+    if not after.is_checkmate():
+        return False
+    them = not us
+    back_rank = 0 if them == chess.WHITE else 7
+    king = after.king(them)
+    if chess.square_rank(king) != back_rank:
+        return False
+    return any(after.piece_type_at(sq) in (chess.ROOK, chess.QUEEN) and chess.square_rank(sq) == back_rank
+               for sq in after.checkers())
+
+
+def find_hanging_piece(before, after, move):
+    if not before.is_capture(move) or before.is_en_passant(move):
+        return False
+    return not after.is_attacked_by(after.turn, move.to_square)
+
+
+def detect_motifs(board):
+    """Find every tactical motif the side to move can play, as a list of Motif(theme, move)."""
+    before = board.copy(stack=False)
+    after = board.copy(stack=False)
+    us = board.turn
+    motifs = []
+    for move in before.legal_moves:
+        after.push(move)
+        checks = {
+            "fork": find_fork(after, move, us),
+            "pin": find_pin(after, move, us),
+            "skewer": find_skewer(after, move, us),
+            "discovered_attack": find_discovered_attack(before, after, move, us),
+            "back_rank_mate": find_back_rank_mate(after, move, us),
+            "hanging_piece": find_hanging_piece(before, after, move),
+        }
+        after.pop()
+        for theme in THEMES:
+            if checks[theme]:
+                motifs.append(Motif(theme, move))
+    return motifs
+
+
+def rate_difficulty(board, motif):
+    """Rate a motif as easy, medium or hard. Quiet moves (no check, no capture) are harder to find."""
+    score = THEME_DIFFICULTY[motif.theme]
+    if not board.is_capture(motif.move) and not board.gives_check(motif.move):
+        score += 1
+    return DIFFICULTIES[min(score, len(DIFFICULTIES) - 1)]
+
+
+def position_key(fen):
+    """The placement, turn, castling and en passant fields of a FEN, ignoring the move counters."""
+    return " ".join(fen.split()[:4])
+
+
+def analyse_fen(fen):
+    """Returns (theme, difficulty, fen, uci) tuples, one per theme found. A malformed FEN yields nothing."""
+    try:
+        board = chess.Board(fen)
+    except ValueError:
+        print(f"Skipping invalid FEN: {fen}")
+        return []
+    seen = set()
+    results = []
+    for motif in detect_motifs(board):
+        if motif.theme in seen:
+            continue
+        seen.add(motif.theme)
+        results.append((motif.theme, rate_difficulty(board, motif), fen, motif.move.uci()))
+    return results
+
+
+def analyse_chunk(fens):
+    """Worker for the process pool: analyse_fen over a chunk of positions."""
+    return [result for fen in fens for result in analyse_fen(fen)]
+
+
+class PuzzleBank:
+    """On-disk index of puzzle positions, keyed by motif and then difficulty."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = {theme: {diff: [] for diff in DIFFICULTIES} for theme in THEMES}
+        self.seen = set()
+
+    @classmethod
+    def load(cls, path):
+        """Load the bank at path. A missing or unreadable index (e.g. from an interrupted build) gives an empty bank."""
+        bank = cls(path)
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            for theme, by_difficulty in stored.items():
+                for difficulty, puzzles in by_difficulty.items():
+                    for puzzle in puzzles:
+                        bank.add(theme, difficulty, puzzle["fen"], puzzle["move"])
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError, KeyError, TypeError, AttributeError) as e:
+            print(f"Error loading puzzle index {path}: {e}")
+            return cls(path)
+        return bank
+
+    def save(self):
+        """Write the index to a temporary file and swap it in, so an interrupted save leaves the old index intact."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def add(self, theme, difficulty, fen, move):
+        """Add a puzzle unless the bank already holds this move in this position for this theme. Returns True if added."""
+        key = (theme, position_key(fen), move)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.index.setdefault(theme, {}).setdefault(difficulty, []).append({"fen": fen, "move": move})
+        return True
+
+    def count(self, theme=None, difficulty=None):
+        return sum(len(puzzles) for _, _, puzzles in self._lists(theme, difficulty))
+
+    def random_puzzle(self, theme=None, difficulty=None):
+        """Pick a puzzle matching the filters, as a dict with theme, difficulty, fen and move (or None)."""
+        lists = self._lists(theme, difficulty)
+        pick = random.randrange(sum(len(puzzles) for _, _, puzzles in lists) or 1)
+        for t, d, puzzles in lists:
+            if pick < len(puzzles):
+                return dict(puzzles[pick], theme=t, difficulty=d)
+            pick -= len(puzzles)
+        return None
+
+    def _lists(self, theme, difficulty):
+        """The (theme, difficulty, puzzles) lists matching the filters, without copying any puzzles."""
+        themes = [theme] if theme else list(self.index)
+        lists = []
+        for t in themes:
+            by_difficulty = self.index.get(t, {})
+            difficulties = [difficulty] if difficulty else list(by_difficulty)
+            for d in difficulties:
+                if by_difficulty.get(d):
+                    lists.append((t, d, by_difficulty[d]))
+        return lists
+
+
+def build_index(fens, path, workers=None, chunksize=64):
+    """
+    Analyse positions in parallel and write their motifs into the puzzle bank at path.
+    Only a few chunks per worker are in flight at once, so fens can be a generator over a large PGN.
+    """
+    bank = PuzzleBank.load(path)
+    fens = iter(fens)
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < window:
+                chunk = list(itertools.islice(fens, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(analyse_chunk, chunk))
+            if not pending:
+                break
+            for theme, difficulty, fen, move in pending.popleft().result():
+                bank.add(theme, difficulty, fen, move)
+    bank.save()
+    return bank
+
+
+def read_positions(path, recent=100000):
+    """
+    Yield FENs from a PGN file (every position of every game) or a text file with one FEN per line.
+    Repeats among the last `recent` distinct positions are skipped, which catches the common opening
+    positions while keeping memory bounded; PuzzleBank.add drops any duplicates that slip through.
+    """
+    seen = OrderedDict()
+    for fen in _read_fens(path):
+        key = position_key(fen)
+        if key in seen:
+            seen.move_to_end(key)
+            continue
+        seen[key] = None
+        if len(seen) > recent:
+            seen.popitem(last=False)
+        yield fen
+
+
+def _read_fens(path):
+    if path.endswith(".pgn"):
+        with open(path) as f:
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                board = game.board()
+                for move in game.mainline_moves():
+                    board.push(move)
+                    if not board.is_game_over():
+                        yield board.fen()
+    else:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the puzzle index from PGN games or a FEN list.")
+    parser.add_argument("source", help="A .pgn file or a text file with one FEN per line")
+    parser.add_argument("-o", "--output", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    bank = build_index(read_positions(args.source), args.output, workers=args.workers)
+    for theme in THEMES:
+        print(f"{theme}: {bank.count(theme)} puzzles")
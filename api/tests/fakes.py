@@ -0,0 +1,32 @@
+# tests/fakes.py
+import chess
+
+class FakeEngine:
+    """Engine backend that plays the first legal move (or a scripted one) without Stockfish."""
+
+    def __init__(self, moves=None):
+        self.moves = list(moves or [])
+        self.difficulty = None
+        self.quit_called = False
+
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+
+    def play(self, board, difficulty):
+        if self.moves:
+            return chess.Move.from_uci(self.moves.pop(0))
+        return next(iter(board.legal_moves))
+
+    def quit(self):
+        self.quit_called = True
+
+class FakeLLM:
+    """LLM backend that records prompts and answers with a fixed riddle."""
+
+    def __init__(self, reply="Test riddle"):
+        self.reply = reply
+        self.prompts = []
+
+    def compose(self, prompt, system):
+        self.prompts.append(prompt)
+        return self.reply
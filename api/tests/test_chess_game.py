@@ -8,11 +8,15 @@ import chess
 import tkinter as tk
 from unittest.mock import MagicMock, patch
 from api.chess_game import ChessGame
+from api.backends import AnthropicRiddler
+from api.game_core import GameCore
+from api.tests.fakes import FakeEngine, FakeLLM
 
 class TestChessGame(unittest.TestCase):
     def setUp(self):
-        # Instantiate ChessGame and withdraw the Tkinter window to avoid GUI pop-ups.
-        self.game = ChessGame()
+        # Instantiate ChessGame with fake backends (no Stockfish or Anthropic) and withdraw the
+        # Tkinter window to avoid GUI pop-ups.
+        self.game = ChessGame(core=GameCore(engine=FakeEngine(), llm=FakeLLM()))
         self.game.window.withdraw()  # Hide the window during tests
         self.game.board.reset()       # Ensure the board is in the initial state
         
@@ -53,9 +57,6 @@ class TestChessGame(unittest.TestCase):
         """Test that the AI move changes the turn on the board."""
         self.game.board.reset()
         current_turn = self.game.board.turn
-        # Skip this test if no engine is available.
-        if self.game.engine is None:
-            self.skipTest("Stockfish engine not available.")
         # Override window.after so that callbacks execute immediately.
         self.game.window.after = lambda delay, func: func()
         self.game.make_ai_move()
@@ -155,8 +156,9 @@ class TestChessGame(unittest.TestCase):
         dummy_message.content = [MagicMock(text="Test riddle")]
         
         # Set the Anthropic API client to a dummy object.
-        self.game.anthropic = MagicMock()
-        self.game.anthropic.messages.create.return_value = dummy_message
+        client = MagicMock()
+        client.messages.create.return_value = dummy_message
+        self.game.core.llm = AnthropicRiddler(client)
         
         # Set the difficulty (which affects the prompt generated).
         self.game.difficulty = "easy"
@@ -0,0 +1,170 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# tests/test_game_core.py
+import unittest
+import chess
+from api import tactics
+from unittest.mock import MagicMock
+from api.game_core import GameCore
+from api.tests.fakes import FakeEngine, FakeLLM
+
+class TestGameCore(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeEngine()
+        self.llm = FakeLLM()
+        self.core = GameCore(engine=self.engine, llm=self.llm)
+        self.events = []
+        for event in ["move_applied", "engine_moved", "hint_ready", "game_over"]:
+            self.core.on(event, lambda *args, event=event: self.events.append((event,) + args))
+
+    def test_initial_board_state(self):
+        """The core starts from the standard position with white to play."""
+        self.assertEqual(self.core.board.fen(), chess.Board().fen())
+        self.assertEqual(self.core.player_color, chess.WHITE)
+
+    def test_unknown_event_is_rejected(self):
+        """Subscribing to an event the core never emits raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.core.on("not_an_event", lambda: None)
+
+    def test_square_clicked_selects_own_piece_only(self):
+        """Clicking an opponent's piece or an empty square selects nothing."""
+        self.core.square_clicked(chess.E7)
+        self.assertIsNone(self.core.selected_square)
+        self.core.square_clicked(chess.E4)
+        self.assertIsNone(self.core.selected_square)
+        self.core.square_clicked(chess.E2)
+        self.assertEqual(self.core.selected_square, chess.E2)
+
+    def test_move_applies_and_engine_replies(self):
+        """A legal player move emits move_applied, then the engine replies with engine_moved."""
+        self.core.square_clicked(chess.E2)
+        self.assertTrue(self.core.square_clicked(chess.E4))
+        self.assertIsNone(self.core.selected_square)
+        self.assertEqual(self.events[0], ("move_applied", chess.Move.from_uci("e2e4")))
+        self.assertEqual(self.events[1][0], "engine_moved")
+        self.assertEqual(self.core.board.turn, chess.WHITE)
+        self.assertEqual(len(self.core.board.move_stack), 2)
+
+    def test_illegal_move_is_ignored(self):
+        """An illegal destination clears the selection and leaves the board unchanged."""
+        self.core.square_clicked(chess.E2)
+        self.assertFalse(self.core.square_clicked(chess.E5))
+        self.assertIsNone(self.core.selected_square)
+        self.assertEqual(self.core.board.fen(), chess.Board().fen())
+        self.assertEqual(self.events, [])
+
+    def test_no_engine_means_no_reply(self):
+        """Without an engine backend the player's move stands and it is black's turn."""
+        core = GameCore()
+        self.assertTrue(core.play_move(chess.Move.from_uci("e2e4")))
+        self.assertEqual(core.board.turn, chess.BLACK)
+        self.assertIsNone(core.make_engine_move())
+
+    def test_engine_error_is_contained(self):
+        """An engine failure is reported but does not raise out of the core."""
+        self.engine.play = MagicMock(side_effect=RuntimeError("engine died"))
+        self.assertTrue(self.core.play_move(chess.Move.from_uci("e2e4")))
+        self.assertEqual(self.core.board.turn, chess.BLACK)
+
+    def test_listener_error_is_not_reported_as_engine_error(self):
+        """A failing engine_moved listener propagates, and the engine's move stays on the board."""
+        def broken_view(move):
+            raise RuntimeError("view broke")
+        self.core.on("engine_moved", broken_view)
+        with self.assertRaises(RuntimeError):
+            self.core.make_engine_move()
+        self.assertEqual(len(self.core.board.move_stack), 1)
+
+    def test_llm_error_is_contained(self):
+        """An LLM failure is reported but does not raise out of the core."""
+        self.llm.compose = MagicMock(side_effect=RuntimeError("api down"))
+        self.assertIsNone(self.core.generate_hint())
+        self.assertEqual(self.events, [])
+
+    def test_game_over_after_player_move(self):
+        """Fool's mate by the player emits game_over and the engine does not move."""
+        self.core.board.set_fen("rnbqkbnr/ppppp2p/5p2/6p1/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 3")
+        self.core.play_move(chess.Move.from_uci("d1h5"))
+        self.assertEqual(self.events[-1], ("game_over", "White wins!"))
+        self.assertNotIn("engine_moved", [e[0] for e in self.events])
+
+    def test_game_over_after_engine_move(self):
+        """An engine move that mates emits engine_moved followed by game_over."""
+        self.engine.moves = ["d8h4"]
+        self.core.board.set_fen("rnbqkbnr/pppp1ppp/8/4p3/6P1/8/PPPPPP1P/RNBQKBNR w KQkq - 0 2")
+        self.core.play_move(chess.Move.from_uci("f2f3"))
+        self.assertEqual([e[0] for e in self.events], ["move_applied", "engine_moved", "game_over"])
+        self.assertEqual(self.events[-1][1], "Black wins!")
+
+    def test_game_result_stalemate(self):
+        """A stalemated position reports Stalemate!"""
+        self.core.board.set_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        self.assertEqual(self.core.game_result(), "Stalemate!")
+
+    def test_new_game_resets_state(self):
+        """new_game restores the start position, selection and player colour."""
+        self.core.play_move(chess.Move.from_uci("e2e4"))
+        self.core.player_color = chess.BLACK
+        self.core.selected_square = chess.D7
+        self.core.new_game()
+        self.assertEqual(self.core.board.fen(), chess.Board().fen())
+        self.assertIsNone(self.core.selected_square)
+        self.assertEqual(self.core.player_color, chess.WHITE)
+
+    def test_set_difficulty_configures_engine(self):
+        """Changing difficulty updates both the core and the engine backend."""
+        self.core.set_difficulty("hard")
+        self.assertEqual(self.core.difficulty, "hard")
+        self.assertEqual(self.engine.difficulty, "hard")
+
+    def test_generate_hint_emits_hint_ready(self):
+        """generate_hint sends a difficulty-specific prompt to the LLM and emits the riddle."""
+        for difficulty in ["easy", "medium", "hard"]:
+            self.core.difficulty = difficulty
+            self.assertEqual(self.core.generate_hint(), "Test riddle")
+        self.assertEqual(len(self.llm.prompts), 3)
+        self.assertEqual(self.events[-1], ("hint_ready", "Test riddle"))
+
+    def test_generate_hint_without_llm(self):
+        """Without an LLM backend no hint is produced."""
+        self.core.llm = None
+        self.assertIsNone(self.core.generate_hint())
+        self.assertEqual(self.events, [])
+
+    def test_hint_prompt_names_motif(self):
+        """The prompt mentions the tactical motif of the suggested move."""
+        self.core.board.set_fen("r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1")
+        prompt = self.core.hint_prompt(tactics.Motif("fork", chess.Move.from_uci("d5c7")))
+        self.assertIn("fork", prompt)
+        self.assertIn("c7", prompt)
+
+    def test_load_puzzle_uses_indexed_motif(self):
+        """A loaded puzzle sets up its position, plays the side to move and hints at the indexed move."""
+        bank = tactics.PuzzleBank(None)
+        bank.add("back_rank_mate", "easy", "r5k1/8/8/8/8/8/5PPP/6K1 b - - 0 1", "a8a1")
+        self.core.puzzle_bank = bank
+        puzzle = self.core.load_puzzle()
+        self.assertEqual(puzzle["theme"], "back_rank_mate")
+        self.assertEqual(self.core.player_color, chess.BLACK)
+        prompt = self.core.hint_prompt()
+        self.assertIn("back rank mate", prompt)
+        self.assertIn("a1", prompt)
+
+    def test_load_puzzle_falls_back_to_other_difficulty(self):
+        """With nothing at the current difficulty, a puzzle of another difficulty is served."""
+        bank = tactics.PuzzleBank(None)
+        bank.add("fork", "hard", "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1", "d5c7")
+        self.core.puzzle_bank = bank
+        self.core.difficulty = "easy"
+        self.assertEqual(self.core.load_puzzle()["difficulty"], "hard")
+
+    def test_load_puzzle_without_bank(self):
+        """With no puzzle bank, load_puzzle returns None and leaves the game alone."""
+        self.assertIsNone(self.core.load_puzzle())
+        self.assertEqual(self.core.board.fen(), chess.Board().fen())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# tests/test_tactics.py
+import unittest
+import tempfile
+import chess
+from api import tactics
+
+class TestTactics(unittest.TestCase):
+    def themes_for(self, fen, uci):
+        """Return the set of themes detected for a specific move in the given position."""
+        move = chess.Move.from_uci(uci)
+        return {m.theme for m in tactics.detect_motifs(chess.Board(fen)) if m.move == move}
+
+    def test_knight_fork(self):
+        """A knight jumping to c7 forks the king on e8 and the rook on a8."""
+        fen = "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1"
+        self.assertIn("fork", self.themes_for(fen, "d5c7"))
+
+    def test_pin(self):
+        """A bishop on b5 pins the knight on c6 to the king on e8."""
+        fen = "4k3/8/2n5/8/8/8/8/4KB2 w - - 0 1"
+        self.assertIn("pin", self.themes_for(fen, "f1b5"))
+
+    def test_skewer(self):
+        """A rook check along the fifth rank skewers the king to the rook behind it."""
+        fen = "8/8/8/4k2r/8/8/8/R5K1 w - - 0 1"
+        self.assertIn("skewer", self.themes_for(fen, "a1a5"))
+
+    def test_skewer_needs_a_safe_slider(self):
+        """A rook check the king can simply capture is not a skewer."""
+        fen = "8/8/8/4k2r/8/8/8/3R2K1 w - - 0 1"
+        self.assertNotIn("skewer", self.themes_for(fen, "d1d5"))
+        fen = "8/8/8/3k3r/8/8/8/2R3K1 w - - 0 1"
+        self.assertNotIn("skewer", self.themes_for(fen, "c1c5"))
+
+    def test_discovered_attack(self):
+        """Moving the knight off the d-file uncovers the rook's attack on the queen."""
+        fen = "3q2k1/8/8/8/3N4/8/8/3R2K1 w - - 0 1"
+        self.assertIn("discovered_attack", self.themes_for(fen, "d4f5"))
+
+    def test_back_rank_mate(self):
+        """A rook on the eighth rank mates a king boxed in by its own pawns."""
+        fen = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+        self.assertIn("back_rank_mate", self.themes_for(fen, "a1a8"))
+
+    def test_hanging_piece(self):
+        """Capturing an undefended knight is flagged as a hanging piece."""
+        fen = "4k3/8/8/3n4/8/8/8/3RK3 w - - 0 1"
+        self.assertIn("hanging_piece", self.themes_for(fen, "d1d5"))
+
+    def test_defended_capture_is_not_hanging(self):
+        """Capturing a pawn-defended knight is not a hanging piece."""
+        fen = "4k3/8/4p3/3n4/8/8/8/3RK3 w - - 0 1"
+        self.assertNotIn("hanging_piece", self.themes_for(fen, "d1d5"))
+
+    def test_starting_position_has_no_motifs(self):
+        """The initial position offers no tactics."""
+        self.assertEqual(tactics.detect_motifs(chess.Board()), [])
+
+    def test_detect_motifs_leaves_board_untouched(self):
+        """Detection works on a copy and does not push moves onto the caller's board."""
+        board = chess.Board("r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1")
+        fen = board.fen()
+        tactics.detect_motifs(board)
+        self.assertEqual(board.fen(), fen)
+        self.assertEqual(len(board.move_stack), 0)
+
+    def test_rate_difficulty(self):
+        """Capturing a hanging piece is easy; a quiet discovered attack is hard."""
+        board = chess.Board("4k3/8/8/3n4/8/8/8/3RK3 w - - 0 1")
+        motif = tactics.Motif("hanging_piece", chess.Move.from_uci("d1d5"))
+        self.assertEqual(tactics.rate_difficulty(board, motif), "easy")
+
+        board = chess.Board("3q2k1/8/8/8/3N4/8/8/3R2K1 w - - 0 1")
+        motif = tactics.Motif("discovered_attack", chess.Move.from_uci("d4f5"))
+        self.assertEqual(tactics.rate_difficulty(board, motif), "hard")
+
+    def test_puzzle_bank_round_trip(self):
+        """Puzzles saved to disk are served back by motif and difficulty."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            bank = tactics.PuzzleBank(path)
+            bank.add("fork", "medium", "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1", "d5c7")
+            bank.save()
+
+            loaded = tactics.PuzzleBank.load(path)
+            puzzle = loaded.random_puzzle("fork", "medium")
+            self.assertEqual(puzzle["move"], "d5c7")
+            self.assertEqual(puzzle["theme"], "fork")
+            self.assertIsNone(loaded.random_puzzle("pin"))
+            self.assertEqual(loaded.count(), 1)
+
+    def test_build_index(self):
+        """build_index analyses positions in a process pool and writes them into the index."""
+        fens = [
+            "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1",
+            "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1",
+            chess.STARTING_FEN,
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            tactics.build_index(fens, path, workers=2)
+            bank = tactics.PuzzleBank.load(path)
+            self.assertGreaterEqual(bank.count("fork"), 1)
+            self.assertGreaterEqual(bank.count("back_rank_mate"), 1)
+
+    def test_build_index_twice_does_not_duplicate(self):
+        """Rebuilding from the same positions, even with different move counters, adds nothing new."""
+        fen = "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            tactics.build_index([fen], path, workers=1)
+            tactics.build_index([fen, "r3k3/8/8/3N4/8/8/8/4K3 w - - 4 9"], path, workers=1)
+            self.assertEqual(tactics.PuzzleBank.load(path).count("fork"), 1)
+
+    def test_build_index_skips_invalid_fen(self):
+        """A malformed line is skipped and the rest of the build is still saved."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            tactics.build_index(["not a fen", "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1"], path, workers=1, chunksize=1)
+            self.assertEqual(tactics.PuzzleBank.load(path).count("fork"), 1)
+
+    def test_load_truncated_index_gives_empty_bank(self):
+        """An index cut short by an interrupted save loads as an empty bank instead of raising."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            with open(path, "w") as f:
+                f.write('{"fork": {"easy": [{"fen": "r3k')
+            self.assertEqual(tactics.PuzzleBank.load(path).count(), 0)
+
+    def test_save_leaves_no_temp_files(self):
+        """save swaps the finished file into place and cleans up after itself."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "puzzle_index.json")
+            bank = tactics.PuzzleBank(path)
+            bank.add("fork", "medium", "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1", "d5c7")
+            bank.save()
+            bank.save()
+            self.assertEqual(os.listdir(tmp), ["puzzle_index.json"])
+
+    def test_read_positions_skips_repeats(self):
+        """Positions repeated across games are yielded only once."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "games.pgn")
+            with open(path, "w") as f:
+                f.write("1. e4 e5 2. Nf3 *\n\n1. e4 e5 2. Bc4 *\n")
+            fens = list(tactics.read_positions(path))
+            self.assertEqual(len(fens), 4)
+
+    def test_read_positions_cache_is_bounded(self):
+        """Only recent positions are remembered, so an old repeat is yielded again."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "positions.txt")
+            fens = [
+                "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1",
+                "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1",
+                "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1",
+            ]
+            with open(path, "w") as f:
+                f.write("\n".join(fens))
+            self.assertEqual(len(list(tactics.read_positions(path, recent=1))), 3)
+            self.assertEqual(len(list(tactics.read_positions(path))), 2)
+
+    def test_random_puzzle_samples_across_lists(self):
+        """random_puzzle with no filters can return a puzzle from any theme and difficulty."""
+        bank = tactics.PuzzleBank(None)
+        bank.add("fork", "medium", "r3k3/8/8/3N4/8/8/8/4K3 w - - 0 1", "d5c7")
+        bank.add("back_rank_mate", "easy", "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", "a1a8")
+        themes = {bank.random_puzzle()["theme"] for _ in range(100)}
+        self.assertEqual(themes, {"fork", "back_rank_mate"})
+        self.assertEqual(bank.count(), 2)
+        self.assertEqual(bank.count("fork", "easy"), 0)
+        self.assertIsNone(bank.random_puzzle("fork", "easy"))
+
+if __name__ == '__main__':
+    unittest.main()